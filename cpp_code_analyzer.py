@@ -7,17 +7,91 @@ Analyzes C++ files for coding guideline violations and provides AI-powered insig
 import os
 import re
 import json
+import bisect
+import hashlib
+import io
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
+import sys
 import argparse
 try:
     from groq import Groq
 except ImportError:
     Groq = None
+try:
+    from groq import AsyncGroq
+except ImportError:
+    AsyncGroq = None
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# slots=True needs Python 3.10, and frozen slotted dataclasses only pickle reliably from 3.11
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 11) else {}
+
+# Function signature shared by the declaration and definition patterns, capturing the name.
+# Qualifier and parameter repetition is capped to bound backtracking, and callers only
+# try these on lines containing '('.
+_FN_SIG = r'^\s*(?:(?:virtual|static|inline)\s+){0,3}(?:const\s+)?[a-zA-Z_][\w<>:]*\s+([a-zA-Z_]\w*)\s*\([^)]{0,500}\)\s*(?:const\s*)?'
+_FN_DECL_RE = re.compile(_FN_SIG + r'[{;]')
+_FN_DEF_RE = re.compile(_FN_SIG + r'{')
+# Unbounded superset of _FN_DECL_RE for the Hyperscan prefilter: bounded repeats under
+# HS_FLAG_PREFILTER took over a second to compile, this form takes milliseconds
+_FN_DECL_PREFILTER = _FN_SIG.replace('{0,3}', '*').replace('{0,500}', '*') + r'[{;]'
+
+# Extensions of the files the checks apply to
+CPP_EXTENSIONS = frozenset({'.cpp', '.cc', '.cxx', '.c', '.hpp', '.h', '.hxx'})
+
+# Total input size below which starting a process pool (~40-60ms) costs more than the
+# checks it spreads out (~10-20ms per 90KB on one core)
+_PARALLEL_MIN_BYTES = 1 << 20
+
+# Report icon and sort rank of each violation severity
+SEVERITY_ICONS = {"error": "🔴", "warning": "🟡", "info": "🔵"}
+SEVERITY_ORDER = {"error": 0, "warning": 1, "info": 2}
+
+
+class _AsciiFold(dict):
+    """str.translate table mapping each code point to an ASCII stand-in of the same re class.
+    
+    Hyperscan's Unicode tables disagree with Python re on \\s and \\w for some code points, so
+    the prefilter scans a folded copy: whitespace becomes ' ', digits '0', other word characters
+    'a' and anything else DEL. Every character folds to one byte, so offsets count characters.
+    """
+    
+    def __missing__(self, c: int) -> int:
+        ch = chr(c)
+        if c < 0x80 and not (ch.isspace() and ch not in '\t\n\r\x0b\x0c '):
+            folded = c
+        elif ch.isspace():
+            folded = ord(' ')
+        elif ch.isdecimal():
+            folded = ord('0')
+        elif ch.isalnum():
+            folded = ord('a')
+        else:
+            folded = 0x7f
+        self[c] = folded
+        return folded
 
 
-@dataclass
+_ASCII_FOLD = _AsciiFold()
+# The only ASCII characters that fold: separators str.isspace() counts as whitespace
+_ASCII_FOLD_BYTES = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Violation:
     """Represents a coding guideline violation."""
     rule_name: str
@@ -29,7 +103,7 @@ class Violation:
     suggestion: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AIAnalysis:
     """Represents AI-powered code analysis results."""
     file_path: str
@@ -42,10 +116,45 @@ class AIAnalysis:
     maintainability_score: int  # 1-10 scale
 
 
+def _violation_dict(violation: Violation) -> Dict[str, Any]:
+    """JSON-ready dict of a violation. Spelled out because dataclasses.asdict() is ~15x slower."""
+    return {
+        "rule_name": violation.rule_name,
+        "description": violation.description,
+        "file_path": violation.file_path,
+        "line_number": violation.line_number,
+        "line_content": violation.line_content,
+        "severity": violation.severity,
+        "suggestion": violation.suggestion
+    }
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dumps fallback serializing report dataclasses as they are reached."""
+    if isinstance(obj, Violation):
+        return _violation_dict(obj)
+    if isinstance(obj, AIAnalysis):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_report(report: Dict[str, Any]) -> str:
+    """Indented JSON of a report that may hold Violation and AIAnalysis objects directly."""
+    if orjson is not None:
+        # orjson serializes dataclasses natively, in field order like _violation_dict
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2).decode('utf-8')
+    # Raw UTF-8 like orjson, so the report doesn't depend on which encoder is installed
+    return json.dumps(report, indent=2, ensure_ascii=False, default=_json_default)
+
+
 class GroqAIAnalyzer:
     """AI-powered code analyzer using Groq."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Bump whenever the prompt or request parameters change, to invalidate cached analyses
+    PROMPT_VERSION = 4
+    
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = None, max_prompt_lines: int = 400,
+                 use_cache: bool = True):
         if not Groq:
             raise ImportError("groq package not installed. Install with: pip install groq")
         
@@ -54,95 +163,288 @@ class GroqAIAnalyzer:
             raise ValueError("Groq API key not provided. Set GROQ_API_KEY environment variable or pass api_key parameter.")
         
         self.client = Groq(api_key=self.api_key)
+        # Small files go to a fast model, larger ones to a bigger model
+        self.fast_model = "llama-3.1-8b-instant"
+        self.deep_model = "llama3-70b-8192"
+        self.fast_model_max_chars = 4096
+        # Ask for a bare JSON object; turn off for models without JSON mode
+        self.json_mode = True
+        # Longer files are sent as their head and tail only, to bound prompt size
+        self.max_prompt_lines = max_prompt_lines
+        self.cache_dir = Path(cache_dir or os.path.expanduser("~/.cache/cpp_analyzer"))
+        self.use_cache = use_cache
+        self._cache_warned = False
         
     def analyze_code(self, file_path: str, code_content: str) -> AIAnalysis:
         """Analyze C++ code using Groq AI."""
+        cached = self._load_cached(file_path, code_content)
+        if cached:
+            return cached
+        
         try:
-            prompt = self._create_analysis_prompt(file_path, code_content)
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert C++ code reviewer and software architect. Analyze the provided C++ code and provide detailed insights about code quality, potential issues, and improvements."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama3-8b-8192",  # or "mixtral-8x7b-32768"
-                temperature=0.1,
-                max_tokens=2048
-            )
+            response = self.client.chat.completions.create(**self._create_request(file_path, code_content))
             
             content = response.choices[0].message.content or ""
-            return self._parse_ai_response(file_path, content)
+            return self._analysis_from_response(file_path, code_content, content)
             
         except Exception as e:
             print(f"Error analyzing code with AI: {e}")
             return self._create_fallback_analysis(file_path)
     
+    def analyze_many(self, items: List[Tuple[str, str]], max_concurrency: int = 8) -> List[AIAnalysis]:
+        """Analyze several (file_path, code_content) pairs concurrently, keeping input order."""
+        analyses, misses = self._split_cached(items)
+        if not misses:
+            return analyses
+        
+        pending = [items[i] for i in misses]
+        if AsyncGroq is not None and not self._in_event_loop():
+            results = asyncio.run(self._analyze_many_async(pending, max_concurrency))
+        else:
+            # Fall back to a thread pool around the sync client; asyncio.run() can't
+            # start inside a caller's running loop (Jupyter, async applications)
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                results = list(executor.map(lambda item: self.analyze_code(*item), pending))
+        
+        for i, analysis in zip(misses, results):
+            analyses[i] = analysis
+        return analyses
+    
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Whether this thread is already running an asyncio event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    async def _analyze_many_async(self, items: List[Tuple[str, str]], max_concurrency: int) -> List[AIAnalysis]:
+        """Run the AI requests on an async client with a bounded concurrency window."""
+        client = AsyncGroq(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        try:
+            return await asyncio.gather(*(
+                self._analyze_code_async(client, semaphore, file_path, code_content)
+                for file_path, code_content in items
+            ))
+        finally:
+            await client.close()
+    
+    async def _analyze_code_async(self, client, semaphore: asyncio.Semaphore, file_path: str, code_content: str) -> AIAnalysis:
+        """Async counterpart of analyze_code."""
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(**self._create_request(file_path, code_content))
+                
+                content = response.choices[0].message.content or ""
+                return self._analysis_from_response(file_path, code_content, content)
+                
+            except Exception as e:
+                print(f"Error analyzing code with AI: {e}")
+                return self._create_fallback_analysis(file_path)
+    
+    def analyze_batch(self, items: List[Tuple[str, str]], poll_interval: float = 10.0,
+                      max_wait: float = 3600.0) -> List[AIAnalysis]:
+        """Analyze several (file_path, code_content) pairs through the Groq batch API, keeping input order.
+        
+        Gives up after max_wait seconds, returning fallback analyses, rather than waiting out the 24h window.
+        """
+        analyses, misses = self._split_cached(items)
+        if not misses:
+            return analyses
+        
+        for i, analysis in zip(misses, self._run_batch([items[i] for i in misses], poll_interval, max_wait)):
+            analyses[i] = analysis
+        return analyses
+    
+    def _run_batch(self, items: List[Tuple[str, str]], poll_interval: float, max_wait: float) -> List[AIAnalysis]:
+        """Submit items as one batch job and wait for its results."""
+        try:
+            # One chat completion request per file, keyed by its position in items
+            payload = "\n".join(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._create_request(file_path, code_content)
+            }) for i, (file_path, code_content) in enumerate(items))
+            
+            input_file = self.client.files.create(
+                file=("batch_requests.jsonl", payload.encode('utf-8')),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            deadline = time.monotonic() + max_wait
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                if time.monotonic() >= deadline:
+                    self.client.batches.cancel(batch.id)
+                    raise TimeoutError(f"batch {batch.id} still '{batch.status}' after {max_wait:.0f}s, cancelled")
+                time.sleep(poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"batch {batch.id} ended with status '{batch.status}'")
+            
+            output = self.client.files.content(batch.output_file_id).read().decode('utf-8')
+            
+        except Exception as e:
+            print(f"Error analyzing code with AI batch: {e}")
+            return [self._create_fallback_analysis(file_path) for file_path, _ in items]
+        
+        contents: Dict[str, str] = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            # A malformed or error line only costs its own file a fallback analysis
+            try:
+                result = json.loads(line)
+                body = (result.get("response") or {}).get("body") or {}
+                if body.get("choices"):
+                    contents[result["custom_id"]] = body["choices"][0]["message"].get("content") or ""
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                print(f"Skipping unreadable AI batch result: {e}")
+        
+        analyses = []
+        for i, (file_path, code_content) in enumerate(items):
+            if str(i) in contents:
+                analyses.append(self._analysis_from_response(file_path, code_content, contents[str(i)]))
+            else:
+                analyses.append(self._create_fallback_analysis(file_path))
+        return analyses
+    
+    def _cache_path(self, code_content: str) -> Path:
+        """Cache location for an analysis of code_content with the current model and prompt."""
+        h = hashlib.blake2b(digest_size=16)
+        model = self._select_model(self._clip(code_content))
+        h.update(f"{model}\0{self.PROMPT_VERSION}\0{self.max_prompt_lines}\0".encode('utf-8'))
+        h.update(code_content.encode('utf-8'))
+        return self.cache_dir / f"{h.hexdigest()}.json"
+    
+    def _load_cached(self, file_path: str, code_content: str) -> Optional[AIAnalysis]:
+        """Return a cached analysis of code_content, or None on a miss."""
+        if not self.use_cache:
+            return None
+        try:
+            with open(self._cache_path(code_content), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data['file_path'] = file_path
+            return AIAnalysis(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    def _store_cached(self, code_content: str, analysis: AIAnalysis) -> AIAnalysis:
+        """Write analysis to the cache (best effort) and return it."""
+        if not self.use_cache:
+            return analysis
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path(code_content), 'w', encoding='utf-8') as f:
+                json.dump(asdict(analysis), f)
+        except OSError as e:
+            # Once per run, and on stderr so it can't corrupt a report written to stdout
+            if not self._cache_warned:
+                self._cache_warned = True
+                print(f"Could not write AI analysis cache: {e}", file=sys.stderr)
+        return analysis
+    
+    def _split_cached(self, items: List[Tuple[str, str]]) -> Tuple[List[Optional[AIAnalysis]], List[int]]:
+        """Look up items in the cache, returning the hits in place and the indices of misses."""
+        analyses = [self._load_cached(file_path, code_content) for file_path, code_content in items]
+        return analyses, [i for i, analysis in enumerate(analyses) if analysis is None]
+    
+    def _select_model(self, code_content: str) -> str:
+        """Pick the model for a file based on its size."""
+        return self.fast_model if len(code_content) < self.fast_model_max_chars else self.deep_model
+    
+    def _clip(self, code_content: str) -> str:
+        """Keep the first three quarters and last quarter of max_prompt_lines, marking the cut."""
+        if code_content.count('\n') <= self.max_prompt_lines:
+            return code_content
+        
+        lines = code_content.split('\n')
+        head = self.max_prompt_lines * 3 // 4
+        tail = self.max_prompt_lines - head
+        marker = f"// ... {len(lines) - head - tail} lines truncated ..."
+        return '\n'.join(lines[:head] + [marker] + lines[len(lines) - tail:])
+    
+    def _create_request(self, file_path: str, code_content: str) -> Dict[str, Any]:
+        """Create the chat completion request body for a file."""
+        code_content = self._clip(code_content)
+        request = {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert C++ code reviewer. Reply with a single JSON object and nothing else."
+                },
+                {
+                    "role": "user",
+                    "content": self._create_analysis_prompt(file_path, code_content)
+                }
+            ],
+            "model": self._select_model(code_content),
+            # Deterministic output keeps responses parseable and cacheable
+            "temperature": 0,
+            # The seven-key reply needs ~1k tokens even for a tiny file; longer files get more room
+            "max_tokens": max(1024, min(2048, 256 + len(code_content) // 8))
+        }
+        if self.json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+    
     def _create_analysis_prompt(self, file_path: str, code_content: str) -> str:
-        """Create a detailed prompt for AI analysis."""
-        return f"""
-Please analyze the following C++ code from file '{file_path}':
+        """Create a compact prompt for AI analysis."""
+        return f"""Analyze this C++ file and return ONLY JSON with keys: overall_score (1-10 integer), \
+code_quality_insights (string), improvement_suggestions (list of strings), potential_bugs (list of strings), \
+security_concerns (list of strings), performance_insights (string), maintainability_score (1-10 integer).
+Cover structure, resource handling, undefined behavior, security, performance, readability, \
+modern C++ practice and thread safety. Keep every suggestion specific and actionable.
 
+File: {file_path}
 ```cpp
 {code_content}
 ```
-
-Provide a comprehensive analysis in the following JSON format:
-{{
-    "overall_score": <1-10 integer>,
-    "code_quality_insights": "<detailed assessment of code quality>",
-    "improvement_suggestions": ["<suggestion 1>", "<suggestion 2>", ...],
-    "potential_bugs": ["<potential bug 1>", "<potential bug 2>", ...],
-    "security_concerns": ["<security issue 1>", "<security issue 2>", ...],
-    "performance_insights": "<performance analysis and suggestions>",
-    "maintainability_score": <1-10 integer>
-}}
-
-Focus on:
-1. Code structure and organization
-2. Memory management and resource handling
-3. Potential runtime errors or undefined behavior
-4. Security vulnerabilities (buffer overflows, injection points, etc.)
-5. Performance bottlenecks and optimization opportunities
-6. Code maintainability and readability
-7. Modern C++ best practices compliance
-8. Thread safety considerations (if applicable)
-
-Provide specific, actionable suggestions. If the code is excellent, mention that too.
 """
     
-    def _parse_ai_response(self, file_path: str, response_content: str) -> AIAnalysis:
-        """Parse AI response and create AIAnalysis object."""
+    def _analysis_from_response(self, file_path: str, code_content: str, response_content: str) -> AIAnalysis:
+        """Parse a model reply, caching the analysis only if the reply parsed."""
+        analysis, parsed = self._parse_ai_response(file_path, response_content)
+        return self._store_cached(code_content, analysis) if parsed else analysis
+    
+    def _parse_ai_response(self, file_path: str, response_content: str) -> Tuple[AIAnalysis, bool]:
+        """Parse AI response and create AIAnalysis object, flagging whether the reply parsed."""
         try:
-            # Try to extract JSON from the response
-            json_start = response_content.find('{')
-            json_end = response_content.rfind('}') + 1
+            try:
+                # JSON mode returns exactly one object
+                data = json.loads(response_content)
+            except json.JSONDecodeError:
+                # Without JSON mode, decode the first JSON object in the response, ignoring any text around it
+                json_start = response_content.find('{')
+                if json_start == -1:
+                    return self._create_fallback_analysis_with_content(file_path, response_content), False
+                data, _ = json.JSONDecoder().raw_decode(response_content, json_start)
             
-            if json_start != -1 and json_end > json_start:
-                json_content = response_content[json_start:json_end]
-                data = json.loads(json_content)
-                
-                return AIAnalysis(
-                    file_path=file_path,
-                    overall_score=int(data.get('overall_score', 5)),
-                    code_quality_insights=data.get('code_quality_insights', ''),
-                    improvement_suggestions=data.get('improvement_suggestions', []),
-                    potential_bugs=data.get('potential_bugs', []),
-                    security_concerns=data.get('security_concerns', []),
-                    performance_insights=data.get('performance_insights', ''),
-                    maintainability_score=int(data.get('maintainability_score', 5))
-                )
-            else:
-                return self._create_fallback_analysis_with_content(file_path, response_content)
+            if not isinstance(data, dict):
+                return self._create_fallback_analysis_with_content(file_path, response_content), False
+            
+            return AIAnalysis(
+                file_path=file_path,
+                overall_score=int(data.get('overall_score', 5)),
+                code_quality_insights=data.get('code_quality_insights', ''),
+                improvement_suggestions=data.get('improvement_suggestions', []),
+                potential_bugs=data.get('potential_bugs', []),
+                security_concerns=data.get('security_concerns', []),
+                performance_insights=data.get('performance_insights', ''),
+                maintainability_score=int(data.get('maintainability_score', 5))
+            ), True
                 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
             print(f"Error parsing AI response: {e}")
-            return self._create_fallback_analysis_with_content(file_path, response_content)
+            return self._create_fallback_analysis_with_content(file_path, response_content), False
     
     def _create_fallback_analysis(self, file_path: str) -> AIAnalysis:
         """Create a fallback analysis when AI analysis fails."""
@@ -174,15 +476,35 @@ Provide specific, actionable suggestions. If the code is excellent, mention that
 class CppGuidelinesAnalyzer:
     """Analyzes C++ code against comprehensive C++ guidelines with AI integration."""
     
-    def __init__(self, guidelines_file: Optional[str] = None, groq_api_key: Optional[str] = None, enable_ai: bool = True):
-        self.guidelines = self.load_guidelines(guidelines_file)
+    # Bump whenever the checks change, to invalidate cached results
+    CHECKS_VERSION = 1
+    # Cached results kept on disk; beyond this the least recently used are evicted
+    CACHE_MAX_ENTRIES = 10000
+    # Cache writes between checks of the entry count (the first write always checks)
+    CACHE_PRUNE_INTERVAL = 1000
+    
+    def __init__(self, guidelines_file: Optional[str] = None, groq_api_key: Optional[str] = None, enable_ai: bool = True,
+                 use_cache: bool = True, guidelines: Optional[Dict[str, Any]] = None, cache_dir: Optional[str] = None):
+        # An already-loaded guidelines dict takes precedence over guidelines_file
+        self.guidelines = guidelines if guidelines is not None else self.load_guidelines(guidelines_file)
         self.violations: List[Violation] = []
         self.ai_analyses: List[AIAnalysis] = []
+        self._pending_ai: List[Tuple[str, str]] = []
+        # AI analyses of this run by content digest, so duplicate files share one request
+        self._ai_by_digest: Dict[str, AIAnalysis] = {}
         self.enable_ai = enable_ai and Groq is not None
-        
+        # Check results are cached by file content next to the AI analyses; None disables it
+        if use_cache:
+            self.cache_dir = Path(cache_dir or Path(os.path.expanduser("~/.cache/cpp_analyzer")) / "checks")
+        else:
+            self.cache_dir = None
+        self._cache_writes = 0
+        self._cache_warned = False
+        self._compile_patterns()
+
         if self.enable_ai:
             try:
-                self.ai_analyzer = GroqAIAnalyzer(groq_api_key)
+                self.ai_analyzer = GroqAIAnalyzer(groq_api_key, use_cache=use_cache)
             except (ImportError, ValueError) as e:
                 print(f"AI analysis disabled: {e}")
                 self.enable_ai = False
@@ -197,7 +519,110 @@ class CppGuidelinesAnalyzer:
                 return json.load(f)
         else:
             return self.get_default_cpp_guidelines()
+
+    def _compile_patterns(self):
+        """Compile every regex used by the checks once, instead of per line."""
+        g = self.guidelines
+        # Part of every cache key, so results from other guidelines are never reused
+        self._guidelines_digest = hashlib.blake2b(json.dumps(g, sort_keys=True).encode('utf-8'), digest_size=16).digest()
+        self._re: Dict[str, re.Pattern] = {
+            # Patterns taken from the guidelines
+            'space_after_keywords': re.compile(g["formatting"]["space_after_keywords"]["pattern"]),
+            'lambda_captures': re.compile(g["modern_cpp"]["lambda_captures"]["pattern"]),
+            # Matches are rare, so a whole-file scan finds the lines to confirm faster than a line loop
+            'lambda_captures_buffer': re.compile(g["modern_cpp"]["lambda_captures"]["pattern"], re.MULTILINE),
+            'class_names': re.compile(g["naming_conventions"]["class_names"]["pattern"]),
+            'function_names': re.compile(g["naming_conventions"]["function_names"]["pattern"]),
+            'member_variables': re.compile(g["naming_conventions"]["member_variables"]["pattern"]),
+            'constant_names': re.compile(g["naming_conventions"]["constant_names"]["pattern"]),
+            # Structural patterns used to locate declarations; a prototype or
+            # declaration is the same signature ending in '{' or ';'
+            'class_decl': re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+            'function_decl': _FN_DECL_RE,
+            'function_def': _FN_DEF_RE,
+            'function_proto': _FN_DECL_RE,
+            'member_var': re.compile(r'^\s*(?:static\s+|const\s+|mutable\s+)*[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]'),
+            'const_var': re.compile(r'const\s+[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+            'scope_token': re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{}();]|\b(?:class|struct)\b', re.DOTALL),
+            # Brace counting tokens within a line; an unterminated '/*' opens a block comment
+            'brace_token': re.compile(r'[{}]|//.*|/\*(?:.*?\*/)?|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''),
+            'include_guard': re.compile(r'#ifndef\s+[A-Z_]+\s*\n.*#define\s+[A-Z_]+', re.DOTALL),
+        }
+
+        # One alternation for the per-line best practice checks, dispatched on the group name.
+        # Keyword spacing stays a separate search: it also runs on the comment lines this
+        # alternation skips, and folding it in measured slower. The function signature and
+        # lambda scans stay per line too, since they only run on lines containing '(' or
+        # flagged by the prefilter, which is cheaper than one MULTILINE pass over the file.
+        memory_keywords = g["best_practices"]["smart_pointers"]["keywords"]
+        best_practices = [
+            ('ns', g["best_practices"]["namespace_std_in_headers"]["pattern"]),
+            ('null', g["best_practices"]["nullptr_usage"]["pattern"]),
+        ]
+        if memory_keywords:
+            best_practices.append(('mem', r'\b(?:' + '|'.join(map(re.escape, memory_keywords)) + r')\b'))
+        self._bp_combined = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in best_practices))
+        
+        # Optional Hyperscan prefilter: one scan per file finds the candidate lines
+        # for every per-line pattern, and Python re only runs on those lines. The cheap
+        # formatting checks are prefiltered too (too long, trailing whitespace, a tab),
+        # so lines no pattern flags are skipped outright.
+        max_length = g["formatting"]["line_length"]["max_length"]
+        self._hs_patterns: List[Tuple[str, str]] = [
+            ('formatting', f'^.{{{max_length + 1}}}'),
+            ('formatting', r'[^\S\n]$'),
+            ('formatting', r'\t'),
+            ('space_after_keywords', g["formatting"]["space_after_keywords"]["pattern"]),
+            *(('best_practices', pattern) for _, pattern in best_practices),
+            # Also covers function_def and function_proto, which match a subset of its lines
+            ('function_decl', _FN_DECL_PREFILTER),
+            ('lambda_captures', self._re['lambda_captures'].pattern),
+        ]
+        self._hs_db = self._compile_prefilter(self._hs_patterns)
     
+    def _compile_prefilter(self, patterns: List[Tuple[str, str]]):
+        """Compile a Hyperscan database for (name, pattern) pairs, or return None if unavailable."""
+        # The scan runs over ASCII-folded text, where non-ASCII literals can't match
+        if hyperscan is None or not all(pattern.isascii() for _, pattern in patterns):
+            return None
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[pattern.encode('ascii') for _, pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                # PREFILTER accepts constructs Hyperscan can't match exactly (lookaheads)
+                # by matching a superset; every candidate is confirmed with Python re
+                flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_PREFILTER] * len(patterns)
+            )
+        except hyperscan.error as e:
+            print(f"Hyperscan prefilter disabled: {e}")
+            return None
+        return db
+    
+    def _prefilter_lines(self, content: str) -> Optional[Dict[str, set]]:
+        """Scan content once with Hyperscan, returning the candidate line numbers per pattern name.
+        
+        Returns None when Hyperscan is unavailable, meaning every line is a candidate.
+        """
+        if self._hs_db is None:
+            return None
+        
+        if content.isascii():
+            buf = content.encode('ascii').translate(_ASCII_FOLD_BYTES)
+        else:
+            buf = content.translate(_ASCII_FOLD).encode('ascii')
+        # Offset of every newline, for match end offset -> line lookups
+        newlines = [match.start() for match in re.finditer(b'\n', buf)]
+        candidates: Dict[str, set] = {name: set() for name, _ in self._hs_patterns}
+        
+        def on_match(pattern_id, start, end, flags, context):
+            candidates[self._hs_patterns[pattern_id][0]].add(bisect.bisect_left(newlines, end - 1) + 1)
+        
+        self._hs_db.scan(buf, match_event_handler=on_match)
+        return candidates
+
     def get_default_cpp_guidelines(self) -> Dict[str, Any]:
         """Comprehensive C++ coding guidelines."""
         return {
@@ -360,83 +785,253 @@ class CppGuidelinesAnalyzer:
             }
         }
     
-    def analyze_file(self, file_path: str) -> List[Violation]:
-        """Analyze a single C++ file for guideline violations and AI insights."""
-        if not file_path.endswith(('.cpp', '.cc', '.cxx', '.c', '.hpp', '.h', '.hxx')):
+    def analyze_file(self, file_path: str, defer_ai: bool = False) -> List[Violation]:
+        """Analyze a single C++ file for guideline violations and AI insights.
+        
+        With defer_ai, the AI request is queued until flush_ai() sends all queued files concurrently.
+        """
+        violations, code_content = self.run_checks(file_path)
+        
+        # Perform AI analysis if enabled
+        if code_content is not None and self.enable_ai and self.ai_analyzer:
+            if defer_ai:
+                self._pending_ai.append((file_path, code_content))
+            else:
+                digest = hashlib.sha1(code_content.encode('utf-8')).hexdigest()
+                if digest not in self._ai_by_digest:
+                    print(f"🤖 Running AI analysis for {file_path}...")
+                    self._ai_by_digest[digest] = self.ai_analyzer.analyze_code(file_path, code_content)
+                self.ai_analyses.append(self._ai_for_path(digest, file_path))
+        
+        return violations
+    
+    def flush_ai(self, max_concurrency: int = 8, batch: bool = False):
+        """Run the AI analyses queued by analyze_file(defer_ai=True)."""
+        ai_jobs, self._pending_ai = self._pending_ai, []
+        self._run_ai_jobs(ai_jobs, max_concurrency, batch)
+    
+    def analyze_files(self, file_paths: List[str], max_concurrency: int = 8, batch: bool = False) -> List[Violation]:
+        """Analyze several files, running their AI analyses concurrently (or as one batch job) once local checks are done."""
+        all_violations = []
+        ai_jobs = []
+        
+        for file_path in file_paths:
+            violations, code_content = self.run_checks(file_path)
+            all_violations.extend(violations)
+            if code_content is not None and self.enable_ai and self.ai_analyzer:
+                ai_jobs.append((file_path, code_content))
+        
+        self._run_ai_jobs(ai_jobs, max_concurrency, batch)
+        return all_violations
+    
+    def analyze_files_parallel(self, file_paths: List[str], max_workers: Optional[int] = None,
+                               max_concurrency: int = 8, batch: bool = False) -> List[Violation]:
+        """Like analyze_files, but run the CPU-bound local checks in a process pool."""
+        if not file_paths:
             return []
         
+        all_violations = []
+        ai_jobs = []
+        max_workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(file_paths) // (max_workers * 4))
+        
+        # Workers build their own analyzer once from the guidelines, without an AI client
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.guidelines, self.cache_dir,
+                                           bool(self.enable_ai and self.ai_analyzer))) as executor:
+            results = executor.map(_check_file_worker, file_paths, chunksize=chunksize)
+            for file_path, (violations, code_content) in zip(file_paths, results):
+                all_violations.extend(violations)
+                if code_content is not None and self.enable_ai and self.ai_analyzer:
+                    ai_jobs.append((file_path, code_content))
+        
+        # AI requests are I/O-bound, so they stay on the concurrent path in this process
+        self._run_ai_jobs(ai_jobs, max_concurrency, batch)
+        return all_violations
+    
+    def _run_ai_jobs(self, ai_jobs: List[Tuple[str, str]], max_concurrency: int, batch: bool):
+        """Send queued (file_path, code_content) pairs to the AI analyzer, once per distinct content."""
+        digests = [hashlib.sha1(code_content.encode('utf-8')).hexdigest() for _, code_content in ai_jobs]
+        unique = {}
+        for job, digest in zip(ai_jobs, digests):
+            if digest not in self._ai_by_digest and digest not in unique:
+                unique[digest] = job
+        
+        if unique and batch:
+            print(f"🤖 Submitting AI batch analysis for {len(unique)} file(s)...")
+            self._ai_by_digest.update(zip(unique, self.ai_analyzer.analyze_batch(list(unique.values()))))
+        elif unique:
+            print(f"🤖 Running AI analysis for {len(unique)} file(s)...")
+            self._ai_by_digest.update(zip(unique, self.ai_analyzer.analyze_many(list(unique.values()), max_concurrency)))
+        
+        for (file_path, _), digest in zip(ai_jobs, digests):
+            self.ai_analyses.append(self._ai_for_path(digest, file_path))
+    
+    def _ai_for_path(self, digest: str, file_path: str) -> AIAnalysis:
+        """The run's AI analysis of a content digest, attributed to file_path."""
+        analysis = self._ai_by_digest[digest]
+        return analysis if analysis.file_path == file_path else replace(analysis, file_path=file_path)
+    
+    def run_checks(self, file_path: str) -> Tuple[List[Violation], Optional[str]]:
+        """Run the guideline checks on a file, returning its violations and content (None if unread)."""
+        if os.path.splitext(file_path)[1] not in CPP_EXTENSIONS:
+            return [], None
+        
         violations = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                code_content = ''.join(lines)
-            
+            raw = Path(file_path).read_bytes()
+            # Decode like read_text(): invalid UTF-8 replaced, universal newlines
+            code_content = raw.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
             is_header = file_path.endswith(('.h', '.hpp', '.hxx'))
             
+            cache_path = self._cache_path(raw, is_header)
+            cached = self._load_cached(file_path, cache_path)
+            if cached is not None:
+                return cached, code_content
+            
+            # Split on '\n' only, like readlines(); str.splitlines() also breaks on form feeds etc.
+            lines = io.StringIO(code_content).readlines()
+            # Shared by every check that skips '//' comment lines
+            is_comment = [line.lstrip().startswith('//') for line in lines]
+            candidates = self._prefilter_lines(code_content)
+            
             # Perform traditional guideline checks
-            violations.extend(self._check_line_length(file_path, lines))
-            violations.extend(self._check_formatting(file_path, lines))
-            violations.extend(self._check_naming_conventions(file_path, lines))
-            violations.extend(self._check_best_practices(file_path, lines, is_header))
-            violations.extend(self._check_code_structure(file_path, lines, is_header))
-            violations.extend(self._check_modern_cpp(file_path, lines))
-            violations.extend(self._check_comments(file_path, lines, is_header))
-            
-            # Perform AI analysis if enabled
-            if self.enable_ai and self.ai_analyzer:
-                print(f"🤖 Running AI analysis for {file_path}...")
-                ai_analysis = self.ai_analyzer.analyze_code(file_path, code_content)
-                self.ai_analyses.append(ai_analysis)
+            violations.extend(self._check_per_line(file_path, lines, is_comment, is_header, candidates))
+            violations.extend(self._check_naming_conventions(file_path, code_content, lines, is_comment, candidates))
+            violations.extend(self._check_code_structure(file_path, code_content, lines, is_header, candidates))
+            violations.extend(self._check_modern_cpp(file_path, code_content, lines, candidates))
+            violations.extend(self._check_comments(file_path, lines, is_comment, is_header, candidates))
             
         except Exception as e:
             print(f"Error analyzing file {file_path}: {e}")
+            return violations, None
         
-        return violations
+        self._store_cached(cache_path, violations)
+        return violations, code_content
     
-    def _check_line_length(self, file_path: str, lines: List[str]) -> List[Violation]:
-        """Check for lines exceeding maximum length."""
-        violations = []
-        max_length = self.guidelines["formatting"]["line_length"]["max_length"]
-        
-        for i, line in enumerate(lines, 1):
-            line_content = line.rstrip()
-            if len(line_content) > max_length:
-                # Allow exceptions for certain cases
-                if (line.strip().startswith('//') or  # Long comments
-                    line.strip().startswith('#include') or  # Include statements  
-                    line.strip().startswith('#ifndef') or  # Header guards
-                    'http' in line.lower()):  # URLs
-                    continue
-                    
-                violations.append(Violation(
-                    rule_name="line_length",
-                    description=self.guidelines["formatting"]["line_length"]["rule"],
-                    file_path=file_path,
-                    line_number=i,
-                    line_content=line_content,
-                    severity=self.guidelines["formatting"]["line_length"]["severity"],
-                    suggestion=f"Consider breaking this line into multiple lines (current: {len(line_content)} chars)"
-                ))
-        
+    def _cache_path(self, raw: bytes, is_header: bool) -> Optional[Path]:
+        """Cache location for the check results of a file's bytes under the current guidelines."""
+        if self.cache_dir is None:
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{self.CHECKS_VERSION}\0{is_header}\0".encode('utf-8'))
+        h.update(self._guidelines_digest)
+        h.update(raw)
+        return self.cache_dir / f"{h.hexdigest()}.json"
+    
+    def _load_cached(self, file_path: str, cache_path: Optional[Path]) -> Optional[List[Violation]]:
+        """Return the cached violations for a file, or None on a miss."""
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            violations = [Violation(file_path=file_path, **item) for item in data]
+        except (OSError, ValueError, TypeError):
+            return None
+        try:
+            # The mtime records the last use, which is what eviction goes by
+            os.utime(cache_path)
+        except OSError:
+            pass
         return violations
     
-    def _check_formatting(self, file_path: str, lines: List[str]) -> List[Violation]:
-        """Check formatting issues."""
+    def _store_cached(self, cache_path: Optional[Path], violations: List[Violation]):
+        """Write a file's violations to the cache (best effort), without the file path."""
+        if cache_path is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump([{k: v for k, v in asdict(violation).items() if k != 'file_path'}
+                           for violation in violations], f)
+        except OSError as e:
+            # Once per run, and on stderr so it can't corrupt a report written to stdout
+            if not self._cache_warned:
+                self._cache_warned = True
+                print(f"Could not write analysis cache: {e}", file=sys.stderr)
+            return
+        if self._cache_writes % self.CACHE_PRUNE_INTERVAL == 0:
+            self._prune_cache()
+        self._cache_writes += 1
+    
+    def _prune_cache(self):
+        """Evict the least recently used check results once the cache exceeds CACHE_MAX_ENTRIES."""
+        try:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.json')]
+        except OSError:
+            return
+        excess = len(entries) - self.CACHE_MAX_ENTRIES
+        if excess <= 0:
+            return
+        entries.sort()
+        # Evict a tenth more than needed so the next runs don't prune again straight away
+        for _, path in entries[:excess + self.CACHE_MAX_ENTRIES // 10]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _check_per_line(self, file_path: str, lines: List[str], is_comment: List[bool], is_header: bool,
+                        candidates: Optional[Dict[str, set]] = None) -> List[Violation]:
+        """Run all line-local formatting and best practice checks in a single pass."""
         violations = []
+        # Rule metadata is loop-invariant, so look it up once per file
+        formatting = self.guidelines["formatting"]
+        best_practices = self.guidelines["best_practices"]
+        max_length = formatting["line_length"]["max_length"]
+        line_length_rule = formatting["line_length"]["rule"]
+        line_length_severity = formatting["line_length"]["severity"]
+        trailing_rule = formatting["trailing_whitespace"]["rule"]
+        trailing_severity = formatting["trailing_whitespace"]["severity"]
+        space_rule = formatting["space_after_keywords"]["rule"]
+        space_severity = formatting["space_after_keywords"]["severity"]
+        namespace_rule = best_practices["namespace_std_in_headers"]["rule"]
+        namespace_severity = best_practices["namespace_std_in_headers"]["severity"]
+        smart_pointers_rule = best_practices["smart_pointers"]["rule"]
+        smart_pointers_severity = best_practices["smart_pointers"]["severity"]
+        smart_pointers_suggestion = best_practices["smart_pointers"]["suggestion"]
+        nullptr_rule = best_practices["nullptr_usage"]["rule"]
+        nullptr_severity = best_practices["nullptr_usage"]["severity"]
+        nullptr_suggestion = best_practices["nullptr_usage"]["suggestion"]
+        if candidates:
+            # Lines no check flagged can't produce a violation, so the loop skips them
+            line_numbers = sorted(candidates['formatting'] | candidates['space_after_keywords'] |
+                                  candidates['best_practices'])
+        else:
+            line_numbers = range(1, len(lines) + 1)
+        space_lines = candidates['space_after_keywords'] if candidates else None
+        best_practice_lines = candidates['best_practices'] if candidates else None
         
-        for i, line in enumerate(lines, 1):
+        for i in line_numbers:
+            line = lines[i - 1]
+            comment_line = is_comment[i - 1]
+            rstripped = line.rstrip()
+            
+            # Check line length; rstrip() only shortens a line, so short ones can't fail
+            if len(line) > max_length and len(rstripped) > max_length:
+                if not self._is_length_exception(line):
+                    violations.append(Violation(
+                        rule_name="line_length",
+                        description=line_length_rule,
+                        file_path=file_path,
+                        line_number=i,
+                        line_content=rstripped,
+                        severity=line_length_severity,
+                        suggestion=f"Consider breaking this line into multiple lines (current: {len(rstripped)} chars)"
+                    ))
+            
             # Check trailing whitespace (but not empty lines)
-            # Remove newline first, then check for trailing spaces/tabs
-            line_without_newline = line.rstrip('\n\r')
-            if line_without_newline.strip() and line_without_newline != line_without_newline.rstrip():
+            if rstripped and line.rstrip('\n\r') != rstripped:
                 violations.append(Violation(
                     rule_name="trailing_whitespace",
-                    description=self.guidelines["formatting"]["trailing_whitespace"]["rule"],
+                    description=trailing_rule,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line_without_newline.rstrip(),
-                    severity=self.guidelines["formatting"]["trailing_whitespace"]["severity"]
+                    line_content=rstripped,
+                    severity=trailing_severity
                 ))
             
             # Check for tabs instead of spaces
@@ -446,37 +1041,98 @@ class CppGuidelinesAnalyzer:
                     description="Use spaces instead of tabs for indentation",
                     file_path=file_path,
                     line_number=i,
-                    line_content=line.rstrip(),
+                    line_content=rstripped,
                     severity="warning",
                     suggestion="Replace tabs with 2 spaces"
                 ))
             
             # Check space after keywords
-            if re.search(self.guidelines["formatting"]["space_after_keywords"]["pattern"], line):
+            if (space_lines is None or i in space_lines) and self._re['space_after_keywords'].search(line):
                 violations.append(Violation(
                     rule_name="space_after_keywords",
-                    description=self.guidelines["formatting"]["space_after_keywords"]["rule"],
+                    description=space_rule,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line.rstrip(),
-                    severity=self.guidelines["formatting"]["space_after_keywords"]["severity"],
+                    line_content=rstripped,
+                    severity=space_severity,
                     suggestion="Add space between keyword and parenthesis: 'if (condition)'"
                 ))
+            
+            # Memory keywords, NULL/0 and 'using namespace std' share one alternation
+            if comment_line and not is_header:
+                continue
+            if best_practice_lines is not None and i not in best_practice_lines:
+                continue
+            has_namespace_std = has_null = False
+            memory_keywords = set()
+            for match in self._bp_combined.finditer(line):
+                if match.lastgroup == 'ns':
+                    has_namespace_std = True
+                elif match.lastgroup == 'mem':
+                    memory_keywords.add(match.group())
+                elif match.lastgroup == 'null':
+                    has_null = True
+            
+            # Check for using namespace std in headers
+            if is_header and has_namespace_std:
+                violations.append(Violation(
+                    rule_name="namespace_usage",
+                    description=namespace_rule,
+                    file_path=file_path,
+                    line_number=i,
+                    line_content=rstripped.lstrip(),
+                    severity=namespace_severity,
+                    suggestion="Use specific std:: prefixes instead"
+                ))
+            
+            if comment_line:
+                continue
+            
+            # Check for raw memory management, one violation per distinct keyword
+            for _ in memory_keywords:
+                violations.append(Violation(
+                    rule_name="smart_pointers",
+                    description=smart_pointers_rule,
+                    file_path=file_path,
+                    line_number=i,
+                    line_content=rstripped.lstrip(),
+                    severity=smart_pointers_severity,
+                    suggestion=smart_pointers_suggestion
+                ))
+            
+            # Check for NULL/0 instead of nullptr
+            if has_null:
+                violations.append(Violation(
+                    rule_name="nullptr_usage",
+                    description=nullptr_rule,
+                    file_path=file_path,
+                    line_number=i,
+                    line_content=rstripped.lstrip(),
+                    severity=nullptr_severity,
+                    suggestion=nullptr_suggestion
+                ))
         
         return violations
     
-    def _check_naming_conventions(self, file_path: str, lines: List[str]) -> List[Violation]:
+    @staticmethod
+    def _is_length_exception(line: str) -> bool:
+        """Long comments, includes, header guards and URLs may exceed the line length limit."""
+        return line.lstrip().startswith(('//', '#include', '#ifndef')) or 'http' in line.lower()
+    
+    def _check_naming_conventions(self, file_path: str, content: str, lines: List[str], is_comment: List[bool],
+                                  candidates: Optional[Dict[str, set]] = None) -> List[Violation]:
         """Check naming convention violations."""
         violations = []
-        content = '\n'.join(lines)
+        function_lines = candidates['function_decl'] if candidates else None
+        # Start offset of every line in content, for offset -> line lookups
+        offsets = [0, *itertools.accumulate(len(line) for line in lines)]
         
         # Check class names
-        class_pattern = r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        for match in re.finditer(class_pattern, content):
+        for match in self._re['class_decl'].finditer(content):
             class_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = bisect.bisect_right(offsets, match.start())
             
-            if line_num <= len(lines) and not re.match(self.guidelines["naming_conventions"]["class_names"]["pattern"], class_name):
+            if not self._re['class_names'].match(class_name):
                 violations.append(Violation(
                     rule_name="class_naming",
                     description=self.guidelines["naming_conventions"]["class_names"]["rule"],
@@ -488,17 +1144,21 @@ class CppGuidelinesAnalyzer:
                 ))
         
         # Check function names (public methods)
-        function_pattern = r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:const\s*)?(?:{|;)'
-        for i, line in enumerate(lines, 1):
-            match = re.search(function_pattern, line)
-            if match and not line.strip().startswith('//'):
+        line_numbers = sorted(function_lines) if function_lines is not None else range(1, len(lines) + 1)
+        for i in line_numbers:
+            line = lines[i - 1]
+            # The pattern needs '(' and a closing '{' or ';', so most lines never reach the regex
+            if '(' not in line or ('{' not in line and ';' not in line) or is_comment[i - 1]:
+                continue
+            match = self._re['function_decl'].search(line)
+            if match:
                 func_name = match.group(1)
                 
                 # Skip common keywords, operators, and constructors/destructors
                 if func_name in ['if', 'for', 'while', 'switch', 'catch', 'return', 'sizeof', 'main'] or func_name.startswith('~'):
                     continue
                 
-                if not re.match(self.guidelines["naming_conventions"]["function_names"]["pattern"], func_name):
+                if not self._re['function_names'].match(func_name):
                     violations.append(Violation(
                         rule_name="function_naming",
                         description=self.guidelines["naming_conventions"]["function_names"]["rule"],
@@ -509,49 +1169,35 @@ class CppGuidelinesAnalyzer:
                         suggestion=f"Function name '{func_name}' should use PascalCase"
                     ))
         
-        # Check member variables (look for m_ prefix)
-        member_var_pattern = r'^\s*(?:static\s+|const\s+|mutable\s+)*[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]'
-        in_class = False
-        brace_count = 0
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Track if we're inside a class
-            if 'class ' in stripped_line or 'struct ' in stripped_line:
-                in_class = True
-                brace_count = 0
-            
-            brace_count += stripped_line.count('{') - stripped_line.count('}')
-            
-            if in_class and brace_count <= 0 and i > 1:
-                in_class = False
+        # Check member variables (look for m_ prefix) on lines directly inside a class/struct body
+        for i, in_class_body in enumerate(self._class_scope_lines(content, offsets), 1):
+            if not in_class_body or is_comment[i-1]:
+                continue
             
-            # Check member variables inside class
-            if in_class and 'private:' in stripped_line:
+            stripped_line = lines[i-1].strip()
+            if not stripped_line or 'private:' in stripped_line:
                 continue
-            elif in_class and stripped_line and not stripped_line.startswith('//'):
-                match = re.search(member_var_pattern, stripped_line)
-                if match:
-                    var_name = match.group(1)
-                    if not var_name.startswith('m_') and not re.match(self.guidelines["naming_conventions"]["member_variables"]["pattern"], var_name):
-                        violations.append(Violation(
-                            rule_name="member_variable_naming",
-                            description=self.guidelines["naming_conventions"]["member_variables"]["rule"],
-                            file_path=file_path,
-                            line_number=i,
-                            line_content=line.strip(),
-                            severity=self.guidelines["naming_conventions"]["member_variables"]["severity"],
-                            suggestion=f"Member variable '{var_name}' should be prefixed with 'm_'"
-                        ))
+            
+            match = self._re['member_var'].search(stripped_line)
+            if match:
+                var_name = match.group(1)
+                if not var_name.startswith('m_') and not self._re['member_variables'].match(var_name):
+                    violations.append(Violation(
+                        rule_name="member_variable_naming",
+                        description=self.guidelines["naming_conventions"]["member_variables"]["rule"],
+                        file_path=file_path,
+                        line_number=i,
+                        line_content=stripped_line,
+                        severity=self.guidelines["naming_conventions"]["member_variables"]["severity"],
+                        suggestion=f"Member variable '{var_name}' should be prefixed with 'm_'"
+                    ))
         
         # Check constants (const variables)
-        const_pattern = r'const\s+[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        for match in re.finditer(const_pattern, content):
+        for match in self._re['const_var'].finditer(content):
             const_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = bisect.bisect_right(offsets, match.start())
             
-            if line_num <= len(lines) and not re.match(self.guidelines["naming_conventions"]["constant_names"]["pattern"], const_name):
+            if not self._re['constant_names'].match(const_name):
                 violations.append(Violation(
                     rule_name="constant_naming",
                     description=self.guidelines["naming_conventions"]["constant_names"]["rule"],
@@ -564,64 +1210,66 @@ class CppGuidelinesAnalyzer:
         
         return violations
     
-    def _check_best_practices(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
-        """Check best practice violations."""
-        violations = []
-        content = '\n'.join(lines)
+    def _class_scope_lines(self, content: str, offsets: List[int]) -> List[bool]:
+        """For each line, whether it starts directly inside a class/struct body.
         
-        # Check for using namespace std in headers
-        if is_header:
-            for i, line in enumerate(lines, 1):
-                if re.search(self.guidelines["best_practices"]["namespace_std_in_headers"]["pattern"], line):
-                    violations.append(Violation(
-                        rule_name="namespace_usage",
-                        description=self.guidelines["best_practices"]["namespace_std_in_headers"]["rule"],
-                        file_path=file_path,
-                        line_number=i,
-                        line_content=line.strip(),
-                        severity=self.guidelines["best_practices"]["namespace_std_in_headers"]["severity"],
-                        suggestion="Use specific std:: prefixes instead"
-                    ))
+        Walks the content once with a small lexer, so braces inside comments and
+        string/char literals are ignored and nested scopes (method bodies) are
+        not mistaken for the class body. Lines are filled in runs between scope
+        changes using the line offset table, so there is no per-line Python work.
+        """
+        num_lines = len(offsets) - 1
+        at_class_scope = [False] * num_lines
+        scopes: List[bool] = []  # True for class/struct bodies
+        pending_class = False
+        in_class = False
+        class_start = 0
         
-        # Check for raw memory management
-        memory_keywords = self.guidelines["best_practices"]["smart_pointers"]["keywords"]
-        for i, line in enumerate(lines, 1):
-            for keyword in memory_keywords:
-                if re.search(rf'\b{keyword}\b', line) and not line.strip().startswith('//'):
-                    violations.append(Violation(
-                        rule_name="smart_pointers",
-                        description=self.guidelines["best_practices"]["smart_pointers"]["rule"],
-                        file_path=file_path,
-                        line_number=i,
-                        line_content=line.strip(),
-                        severity=self.guidelines["best_practices"]["smart_pointers"]["severity"],
-                        suggestion=self.guidelines["best_practices"]["smart_pointers"]["suggestion"]
-                    ))
+        for match in self._re['scope_token'].finditer(content):
+            token = match.group()
+            if token == '{':
+                scopes.append(pending_class)
+                pending_class = False
+            elif token == '}':
+                if scopes:
+                    scopes.pop()
+            elif token in ('class', 'struct'):
+                pending_class = True
+                continue
+            elif token in (';', '('):
+                # Forward declarations, 'struct stat st;' and template parameters
+                pending_class = False
+                continue
+            else:
+                # Comments and literals only need skipping
+                continue
+            
+            now_in_class = bool(scopes) and scopes[-1]
+            if now_in_class != in_class:
+                if in_class:
+                    # Lines starting after the opening brace, up to and including this one
+                    first = bisect.bisect_right(offsets, class_start)
+                    last = bisect.bisect_right(offsets, match.start())
+                    at_class_scope[first:last] = [True] * (last - first)
+                in_class = now_in_class
+                class_start = match.start()
         
-        # Check for NULL/0 instead of nullptr
-        for i, line in enumerate(lines, 1):
-            if re.search(self.guidelines["best_practices"]["nullptr_usage"]["pattern"], line) and not line.strip().startswith('//'):
-                violations.append(Violation(
-                    rule_name="nullptr_usage",
-                    description=self.guidelines["best_practices"]["nullptr_usage"]["rule"],
-                    file_path=file_path,
-                    line_number=i,
-                    line_content=line.strip(),
-                    severity=self.guidelines["best_practices"]["nullptr_usage"]["severity"],
-                    suggestion=self.guidelines["best_practices"]["nullptr_usage"]["suggestion"]
-                ))
+        if in_class:
+            first = bisect.bisect_right(offsets, class_start)
+            at_class_scope[first:] = [True] * (num_lines - first)
         
-        return violations
+        return at_class_scope
     
-    def _check_code_structure(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
+    def _check_code_structure(self, file_path: str, content: str, lines: List[str], is_header: bool,
+                              candidates: Optional[Dict[str, set]] = None) -> List[Violation]:
         """Check code structure issues."""
         violations = []
+        function_lines = candidates['function_decl'] if candidates else None
         
         # Check for include guards in headers
         if is_header:
-            content = '\n'.join(lines)
             has_pragma_once = '#pragma once' in content
-            has_include_guard = re.search(r'#ifndef\s+[A-Z_]+\s*\n.*#define\s+[A-Z_]+', content, re.DOTALL)
+            has_include_guard = self._re['include_guard'].search(content)
             
             if not has_pragma_once and not has_include_guard:
                 violations.append(Violation(
@@ -635,62 +1283,133 @@ class CppGuidelinesAnalyzer:
                 ))
         
         # Check function length
-        current_function_start = None
-        brace_count = 0
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Detect function start
-            if re.search(r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\([^)]*\)\s*(?:const\s*)?{', line):
-                current_function_start = i
-                brace_count = 1
-            elif current_function_start:
-                brace_count += stripped_line.count('{') - stripped_line.count('}')
-                
-                if brace_count == 0:  # Function ended
-                    function_length = i - current_function_start + 1
-                    if function_length > self.guidelines["code_structure"]["function_length"]["max_lines"]:
-                        violations.append(Violation(
-                            rule_name="function_length",
-                            description=self.guidelines["code_structure"]["function_length"]["rule"],
-                            file_path=file_path,
-                            line_number=current_function_start,
-                            line_content=lines[current_function_start-1].strip(),
-                            severity=self.guidelines["code_structure"]["function_length"]["severity"],
-                            suggestion=f"Function is {function_length} lines long, consider breaking it down"
-                        ))
-                    current_function_start = None
+        max_lines = self.guidelines["code_structure"]["function_length"]["max_lines"]
+        line_numbers = sorted(function_lines) if function_lines is not None else range(1, len(lines) + 1)
+        def_lines = [i for i in line_numbers
+                     if '(' in lines[i - 1] and '{' in lines[i - 1] and self._re['function_def'].search(lines[i - 1])]
+        
+        for function_start, function_end in self._function_spans(lines, def_lines):
+            function_length = function_end - function_start + 1
+            if function_length > max_lines:
+                violations.append(Violation(
+                    rule_name="function_length",
+                    description=self.guidelines["code_structure"]["function_length"]["rule"],
+                    file_path=file_path,
+                    line_number=function_start,
+                    line_content=lines[function_start-1].strip(),
+                    severity=self.guidelines["code_structure"]["function_length"]["severity"],
+                    suggestion=f"Function is {function_length} lines long, consider breaking it down"
+                ))
         
         return violations
     
-    def _check_modern_cpp(self, file_path: str, lines: List[str]) -> List[Violation]:
+    def _function_spans(self, lines: List[str], def_lines: List[int]) -> List[Tuple[int, int]]:
+        """Return (start_line, end_line) for the body opened on each function definition line.
+        
+        Brace depth is tracked in one pass with two states, code and block comment.
+        Lines without braces are skipped and plain code lines use str.count; only lines
+        with comments or literals are tokenized, so their braces are ignored. A
+        definition line reached while another body is open restarts tracking from it.
+        """
+        spans = []
+        num_lines = len(lines)
+        
+        for k, function_start in enumerate(def_lines):
+            next_def = def_lines[k + 1] if k + 1 < len(def_lines) else num_lines + 1
+            depth = 0
+            in_block_comment = False
+            
+            for i in range(function_start, next_def):
+                line = lines[i - 1]
+                if in_block_comment or '/*' in line:
+                    delta, in_block_comment = self._brace_delta(line, in_block_comment)
+                    depth += delta
+                elif '{' not in line and '}' not in line:
+                    # Most lines have no braces, and literals or '//' can't change that
+                    continue
+                elif '"' in line or "'" in line or '//' in line:
+                    depth += self._brace_delta(line, False)[0]
+                else:
+                    depth += line.count('{') - line.count('}')
+                
+                if depth <= 0:
+                    spans.append((function_start, i))
+                    break
+        
+        return spans
+    
+    def _brace_delta(self, line: str, in_block_comment: bool) -> Tuple[int, bool]:
+        """Net braces opened on a line outside comments and literals, and whether a block comment stays open."""
+        pos = 0
+        if in_block_comment:
+            end = line.find('*/')
+            if end == -1:
+                return 0, True
+            pos = end + 2
+        
+        delta = 0
+        for match in self._re['brace_token'].finditer(line, pos):
+            token = match.group()
+            if token == '{':
+                delta += 1
+            elif token == '}':
+                delta -= 1
+            elif token.startswith('/*') and (len(token) < 4 or not token.endswith('*/')):
+                return delta, True
+        return delta, False
+    
+    def _check_modern_cpp(self, file_path: str, content: str, lines: List[str],
+                          candidates: Optional[Dict[str, set]] = None) -> List[Violation]:
         """Check modern C++ feature usage."""
         violations = []
+        lambda_captures = self.guidelines["modern_cpp"]["lambda_captures"]
+        lambda_search = self._re['lambda_captures'].search
+        if candidates:
+            line_numbers = sorted(candidates['lambda_captures'])
+        else:
+            line_numbers = self._match_lines(content, self._re['lambda_captures_buffer'])
         
         # Check lambda default captures
-        for i, line in enumerate(lines, 1):
-            if re.search(self.guidelines["modern_cpp"]["lambda_captures"]["pattern"], line):
+        for i in line_numbers:
+            line = lines[i - 1]
+            if lambda_search(line):
                 violations.append(Violation(
                     rule_name="lambda_captures",
-                    description=self.guidelines["modern_cpp"]["lambda_captures"]["rule"],
+                    description=lambda_captures["rule"],
                     file_path=file_path,
                     line_number=i,
                     line_content=line.strip(),
-                    severity=self.guidelines["modern_cpp"]["lambda_captures"]["severity"],
-                    suggestion=self.guidelines["modern_cpp"]["lambda_captures"]["suggestion"]
+                    severity=lambda_captures["severity"],
+                    suggestion=lambda_captures["suggestion"]
                 ))
         
         return violations
     
-    def _check_comments(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
+    @staticmethod
+    def _match_lines(content: str, pattern: re.Pattern) -> List[int]:
+        """Return the sorted line numbers spanned by matches of pattern in content."""
+        line_numbers = []
+        line_num, last = 1, 0
+        for match in pattern.finditer(content):
+            # str.count keeps the offset -> line bookkeeping in C
+            line_num += content.count('\n', last, match.start())
+            last = match.start()
+            end_line = line_num + content.count('\n', match.start(), match.end())
+            first = max(line_num, line_numbers[-1] + 1) if line_numbers else line_num
+            line_numbers.extend(range(first, end_line + 1))
+        return line_numbers
+    
+    def _check_comments(self, file_path: str, lines: List[str], is_comment: List[bool], is_header: bool,
+                        candidates: Optional[Dict[str, set]] = None) -> List[Violation]:
         """Check comment requirements."""
         violations = []
         
         if is_header:
+            line_numbers = sorted(candidates['function_decl']) if candidates else range(1, len(lines) + 1)
             # Check for function comments in headers
-            for i, line in enumerate(lines, 1):
-                if re.search(r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\([^)]*\)\s*(?:const\s*)?[;{]', line):
+            for i in line_numbers:
+                line = lines[i - 1]
+                if '(' in line and ('{' in line or ';' in line) and self._re['function_proto'].search(line):
                     # Check if previous lines have doxygen comment
                     has_doxygen = False
                     for j in range(max(0, i-5), i):
@@ -698,7 +1417,7 @@ class CppGuidelinesAnalyzer:
                             has_doxygen = True
                             break
                     
-                    if not has_doxygen and not line.strip().startswith('//'):
+                    if not has_doxygen and not is_comment[i-1]:
                         violations.append(Violation(
                             rule_name="function_comments",
                             description=self.guidelines["comments"]["function_comments"]["rule"],
@@ -711,16 +1430,15 @@ class CppGuidelinesAnalyzer:
         
         return violations
     
-    def analyze_pr_files(self, changed_files: List[str]) -> List[Violation]:
+    def analyze_pr_files(self, changed_files: List[str], batch: bool = False) -> List[Violation]:
         """Analyze multiple files (e.g., from a PR)."""
-        all_violations = []
-        
-        for file_path in changed_files:
-            if os.path.exists(file_path):
-                violations = self.analyze_file(file_path)
-                all_violations.extend(violations)
-        
-        return all_violations
+        # Cheap extension test first, so non-C++ files never touch the filesystem
+        existing = [f for f in changed_files if os.path.splitext(f)[1] in CPP_EXTENSIONS and os.path.exists(f)]
+        # Only worth a process pool for several cores and enough input to amortize starting it
+        if (len(existing) > 1 and (os.cpu_count() or 1) > 1
+                and sum(os.path.getsize(f) for f in existing) >= _PARALLEL_MIN_BYTES):
+            return self.analyze_files_parallel(existing, batch=batch)
+        return self.analyze_files(existing, batch=batch)
     
     def generate_report(self, violations: List[Violation], format_type: str = "text") -> str:
         """Generate a comprehensive report including violations and AI analysis."""
@@ -731,131 +1449,125 @@ class CppGuidelinesAnalyzer:
     
     def _generate_text_report(self, violations: List[Violation]) -> str:
         """Generate a comprehensive human-readable text report with AI analysis."""
-        report = f"📋 C++ Code Analysis Report\n"
-        report += f"{'=' * 50}\n\n"
+        parts = [f"📋 C++ Code Analysis Report\n"]
+        parts.append(f"{'=' * 50}\n\n")
         
         # Guidelines violations section
         if violations:
-            # Group by severity
-            errors = [v for v in violations if v.severity == "error"]
-            warnings = [v for v in violations if v.severity == "warning"]
-            info = [v for v in violations if v.severity == "info"]
-            
-            report += f"## 📏 Guidelines Compliance\n"
-            report += f"  🔴 Errors: {len(errors)}\n"
-            report += f"  🟡 Warnings: {len(warnings)}\n"
-            report += f"  🔵 Info: {len(info)}\n\n"
-            
-            # Group by file
-            files_violations = {}
+            # Count by severity and group by file in one pass
+            counts = dict.fromkeys(SEVERITY_ORDER, 0)
+            files_violations = defaultdict(list)
             for violation in violations:
-                if violation.file_path not in files_violations:
-                    files_violations[violation.file_path] = []
+                counts[violation.severity] += 1
                 files_violations[violation.file_path].append(violation)
             
+            parts.append(f"## 📏 Guidelines Compliance\n")
+            parts.append(f"  🔴 Errors: {counts['error']}\n")
+            parts.append(f"  🟡 Warnings: {counts['warning']}\n")
+            parts.append(f"  🔵 Info: {counts['info']}\n\n")
+            
             for file_path, file_violations in files_violations.items():
-                report += f"### 📁 {file_path}\n"
-                report += f"{'-' * (len(file_path) + 6)}\n"
+                parts.append(f"### 📁 {file_path}\n")
+                parts.append(f"{'-' * (len(file_path) + 6)}\n")
                 
                 for violation in file_violations:
-                    icon = {"error": "🔴", "warning": "🟡", "info": "🔵"}[violation.severity]
-                    report += f"{icon} Line {violation.line_number}: {violation.description}\n"
-                    report += f"   Code: {violation.line_content[:80]}{'...' if len(violation.line_content) > 80 else ''}\n"
+                    icon = SEVERITY_ICONS[violation.severity]
+                    parts.append(f"{icon} Line {violation.line_number}: {violation.description}\n")
+                    parts.append(f"   Code: {violation.line_content[:80]}{'...' if len(violation.line_content) > 80 else ''}\n")
                     if violation.suggestion:
-                        report += f"   💡 {violation.suggestion}\n"
-                    report += "\n"
+                        parts.append(f"   💡 {violation.suggestion}\n")
+                    parts.append("\n")
         else:
-            report += "## 📏 Guidelines Compliance\n"
-            report += "✅ No coding guideline violations found!\n\n"
+            parts.append("## 📏 Guidelines Compliance\n")
+            parts.append("✅ No coding guideline violations found!\n\n")
         
         # AI Analysis section
         if self.ai_analyses:
-            report += "## 🤖 AI Code Analysis\n"
-            report += f"{'=' * 30}\n\n"
+            parts.append("## 🤖 AI Code Analysis\n")
+            parts.append(f"{'=' * 30}\n\n")
             
             for ai_analysis in self.ai_analyses:
-                report += f"### 📁 {ai_analysis.file_path}\n"
-                report += f"{'-' * (len(ai_analysis.file_path) + 6)}\n"
+                parts.append(f"### 📁 {ai_analysis.file_path}\n")
+                parts.append(f"{'-' * (len(ai_analysis.file_path) + 6)}\n")
                 
                 # Overall scores
-                report += f"**Overall Score:** {ai_analysis.overall_score}/10\n"
-                report += f"**Maintainability:** {ai_analysis.maintainability_score}/10\n\n"
+                parts.append(f"**Overall Score:** {ai_analysis.overall_score}/10\n")
+                parts.append(f"**Maintainability:** {ai_analysis.maintainability_score}/10\n\n")
                 
                 # Code quality insights
                 if ai_analysis.code_quality_insights:
-                    report += f"**Code Quality Insights:**\n{ai_analysis.code_quality_insights}\n\n"
+                    parts.append(f"**Code Quality Insights:**\n{ai_analysis.code_quality_insights}\n\n")
                 
                 # Performance insights
                 if ai_analysis.performance_insights:
-                    report += f"**Performance Analysis:**\n{ai_analysis.performance_insights}\n\n"
+                    parts.append(f"**Performance Analysis:**\n{ai_analysis.performance_insights}\n\n")
                 
                 # Improvement suggestions
                 if ai_analysis.improvement_suggestions:
-                    report += f"**💡 Improvement Suggestions:**\n"
+                    parts.append(f"**💡 Improvement Suggestions:**\n")
                     for i, suggestion in enumerate(ai_analysis.improvement_suggestions, 1):
-                        report += f"  {i}. {suggestion}\n"
-                    report += "\n"
+                        parts.append(f"  {i}. {suggestion}\n")
+                    parts.append("\n")
                 
                 # Potential bugs
                 if ai_analysis.potential_bugs:
-                    report += f"**🐛 Potential Issues:**\n"
+                    parts.append(f"**🐛 Potential Issues:**\n")
                     for i, bug in enumerate(ai_analysis.potential_bugs, 1):
-                        report += f"  {i}. {bug}\n"
-                    report += "\n"
+                        parts.append(f"  {i}. {bug}\n")
+                    parts.append("\n")
                 
                 # Security concerns
                 if ai_analysis.security_concerns:
-                    report += f"**🔒 Security Concerns:**\n"
+                    parts.append(f"**🔒 Security Concerns:**\n")
                     for i, concern in enumerate(ai_analysis.security_concerns, 1):
-                        report += f"  {i}. {concern}\n"
-                    report += "\n"
+                        parts.append(f"  {i}. {concern}\n")
+                    parts.append("\n")
                 
-                report += "\n"
+                parts.append("\n")
         
-        return report
+        return "".join(parts)
     
     def _generate_json_report(self, violations: List[Violation]) -> str:
         """Generate a comprehensive JSON report with AI analysis."""
-        violations_data = []
+        counts = dict.fromkeys(SEVERITY_ORDER, 0)
         for violation in violations:
-            violations_data.append({
-                "rule_name": violation.rule_name,
-                "description": violation.description,
-                "file_path": violation.file_path,
-                "line_number": violation.line_number,
-                "line_content": violation.line_content,
-                "severity": violation.severity,
-                "suggestion": violation.suggestion
-            })
-        
-        ai_analyses_data = []
-        for analysis in self.ai_analyses:
-            ai_analyses_data.append({
-                "file_path": analysis.file_path,
-                "overall_score": analysis.overall_score,
-                "maintainability_score": analysis.maintainability_score,
-                "code_quality_insights": analysis.code_quality_insights,
-                "improvement_suggestions": analysis.improvement_suggestions,
-                "potential_bugs": analysis.potential_bugs,
-                "security_concerns": analysis.security_concerns,
-                "performance_insights": analysis.performance_insights
-            })
-        
-        return json.dumps({
+            counts[violation.severity] += 1
+        
+        return dumps_report({
             "guidelines_analysis": {
                 "summary": {
                     "total_violations": len(violations),
-                    "errors": len([v for v in violations if v.severity == "error"]),
-                    "warnings": len([v for v in violations if v.severity == "warning"]),
-                    "info": len([v for v in violations if v.severity == "info"])
+                    "errors": counts["error"],
+                    "warnings": counts["warning"],
+                    "info": counts["info"]
                 },
-                "violations": violations_data
+                "violations": violations
             },
             "ai_analysis": {
                 "enabled": self.enable_ai,
-                "analyses": ai_analyses_data
+                "analyses": self.ai_analyses
             }
-        }, indent=2)
+        })
+
+
+# Per-process analyzer used by analyze_files_parallel workers
+_worker_analyzer: Optional[CppGuidelinesAnalyzer] = None
+# Whether the parent sends file contents to AI; otherwise workers don't ship them back
+_worker_returns_content = False
+
+
+def _init_worker(guidelines: Dict[str, Any], cache_dir: Optional[Path], returns_content: bool):
+    """Build the worker's analyzer once, reusing the parent's guidelines and cache setting."""
+    global _worker_analyzer, _worker_returns_content
+    _worker_analyzer = CppGuidelinesAnalyzer(enable_ai=False, use_cache=cache_dir is not None,
+                                             guidelines=guidelines, cache_dir=cache_dir)
+    _worker_returns_content = returns_content
+
+
+def _check_file_worker(file_path: str) -> Tuple[List[Violation], Optional[str]]:
+    """Run the local checks on a file inside a worker process."""
+    violations, code_content = _worker_analyzer.run_checks(file_path)
+    return violations, code_content if _worker_returns_content else None
 
 
 def main():
@@ -867,19 +1579,22 @@ def main():
     parser.add_argument("--output", help="Output file (default: stdout)")
     parser.add_argument("--groq-api-key", help="Groq API key for AI analysis (or set GROQ_API_KEY env var)")
     parser.add_argument("--disable-ai", action="store_true", help="Disable AI analysis")
+    parser.add_argument("--batch", action="store_true", help="Submit AI analyses as one Groq batch job (cheaper, slower turnaround)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write cached results")
     
     args = parser.parse_args()
     
     analyzer = CppGuidelinesAnalyzer(
         guidelines_file=args.guidelines,
         groq_api_key=args.groq_api_key,
-        enable_ai=not args.disable_ai
+        enable_ai=not args.disable_ai,
+        use_cache=not args.no_cache
     )
-    violations = analyzer.analyze_pr_files(args.files)
+    violations = analyzer.analyze_pr_files(args.files, batch=args.batch)
     report = analyzer.generate_report(violations, args.format)
     
     if args.output:
-        with open(args.output, 'w') as f:
+        with open(args.output, 'w', encoding='utf-8') as f:
             f.write(report)
         print(f"Report saved to {args.output}")
     else:
@@ -43,10 +43,13 @@ def main():
     all_violations = []
     for file_path in existing_files:
         print(f"🔍 Analyzing {file_path}...")
-        violations = analyzer.analyze_file(file_path)
+        violations = analyzer.analyze_file(file_path, defer_ai=True)
         all_violations.extend(violations)
         print(f"   Found {len(violations)} guideline violations")
     
+    # Send the queued AI analyses together rather than one file at a time
+    analyzer.flush_ai()
+    
     print(f"\n📊 Analysis Summary:")
     print(f"   Total violations: {len(all_violations)}")
     print(f"   AI analyses: {len(analyzer.ai_analyses)}")
@@ -6,38 +6,55 @@ Analyzes files changed in a GitHub PR for coding guideline violations.
 
 import os
 import subprocess
-import json
 import requests
 from typing import List, Dict, Any, Optional
 import argparse
-from cpp_code_analyzer import CppGuidelinesAnalyzer
+from collections import defaultdict
+from cpp_code_analyzer import CppGuidelinesAnalyzer, CPP_EXTENSIONS, SEVERITY_ICONS, SEVERITY_ORDER, dumps_report
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
 class PRAnalyzer:
     """Analyzes PR files for coding guideline violations with AI insights."""
     
-    def __init__(self, github_token: Optional[str] = None, groq_api_key: Optional[str] = None, enable_ai: bool = True):
+    def __init__(self, github_token: Optional[str] = None, groq_api_key: Optional[str] = None, enable_ai: bool = True,
+                 use_cache: bool = True):
         self.github_token = github_token
         self.groq_api_key = groq_api_key
         self.enable_ai = enable_ai
+        self.use_cache = use_cache
+        # Analyzer from the last analyze_pr_files call, reused for its report
+        self.last_analyzer: Optional[CppGuidelinesAnalyzer] = None
         self.headers = {}
         if github_token:
             self.headers["Authorization"] = f"token {github_token}"
+        # One keep-alive connection pool for every GitHub API request
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
     
     def get_pr_changed_files(self, repo_owner: str, repo_name: str, pr_number: int) -> List[str]:
         """Get list of files changed in a PR using GitHub API."""
         url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/files"
         
+        params = {"per_page": 100}
+        changed_files = []
+        
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            files_data = response.json()
-            changed_files = []
-            
-            for file_info in files_data:
-                # Only include files that exist (not deleted)
-                if file_info["status"] != "removed":
-                    changed_files.append(file_info["filename"])
+            # The file list is paginated; 'next' links already carry the query parameters
+            while url:
+                response = self._session.get(url, params=params)
+                response.raise_for_status()
+                
+                for file_info in response.json():
+                    # Only include C/C++ files that exist (not deleted)
+                    if file_info["status"] != "removed" and os.path.splitext(file_info["filename"])[1] in CPP_EXTENSIONS:
+                        changed_files.append(file_info["filename"])
+                
+                url = response.links.get("next", {}).get("url")
+                params = None
             
             return changed_files
             
@@ -47,6 +64,10 @@ class PRAnalyzer:
     
     def get_git_changed_files(self, base_branch: str = "main") -> List[str]:
         """Get list of changed files using git diff."""
+        changed_files = self._pygit2_changed_files(base_branch)
+        if changed_files is not None:
+            return [f for f in changed_files if os.path.exists(f)]
+        
         try:
             # Get changed files compared to base branch
             result = subprocess.run(
@@ -69,6 +90,10 @@ class PRAnalyzer:
     
     def get_staged_files(self) -> List[str]:
         """Get list of staged files using git."""
+        staged_files = self._pygit2_changed_files()
+        if staged_files is not None:
+            return [f for f in staged_files if os.path.exists(f)]
+        
         try:
             result = subprocess.run(
                 ["git", "diff", "--cached", "--name-only"],
@@ -86,14 +111,45 @@ class PRAnalyzer:
             print(f"Error getting staged files: {e}")
             return []
     
+    def _pygit2_changed_files(self, base_branch: Optional[str] = None) -> Optional[List[str]]:
+        """List files changed since the merge base with base_branch, or staged ones if None, via libgit2.
+        
+        Returns None when pygit2 is unavailable or fails, so callers fall back to the git CLI.
+        """
+        if pygit2 is None:
+            return None
+        try:
+            repo = pygit2.Repository(pygit2.discover_repository(os.getcwd()))
+            if base_branch is None:
+                # Same as `git diff --cached`: HEAD's tree to the index
+                diff = repo.index.diff_to_tree(repo.head.peel(pygit2.Tree))
+            else:
+                # Same as `git diff base...HEAD`: merge base to HEAD
+                head = repo.revparse_single("HEAD").peel(pygit2.Commit)
+                base = repo.revparse_single(base_branch).peel(pygit2.Commit)
+                merge_base = repo.merge_base(base.id, head.id)
+                if merge_base is None:
+                    return None
+                diff = repo.diff(merge_base, head)
+            # Deleted paths are kept, like --name-only; callers drop the ones missing on disk
+            return [delta.new_file.path for delta in diff.deltas]
+        except (pygit2.GitError, KeyError, ValueError, TypeError):
+            return None
+    
     def analyze_pr_files(self, files: List[str], language: str = "cpp") -> Dict[str, Any]:
         """Analyze files for coding guideline violations and AI insights."""
         if language.lower() == "cpp":
             analyzer = CppGuidelinesAnalyzer(
                 groq_api_key=self.groq_api_key,
-                enable_ai=self.enable_ai
+                enable_ai=self.enable_ai,
+                use_cache=self.use_cache
             )
             violations = analyzer.analyze_pr_files(files)
+            self.last_analyzer = analyzer
+            
+            counts = dict.fromkeys(SEVERITY_ORDER, 0)
+            for violation in violations:
+                counts[violation.severity] += 1
             
             return {
                 "language": language,
@@ -102,9 +158,9 @@ class PRAnalyzer:
                 "violations": violations,
                 "ai_analyses": analyzer.ai_analyses,  # Include AI analyses
                 "summary": {
-                    "errors": len([v for v in violations if v.severity == "error"]),
-                    "warnings": len([v for v in violations if v.severity == "warning"]),
-                    "info": len([v for v in violations if v.severity == "info"])
+                    "errors": counts["error"],
+                    "warnings": counts["warning"],
+                    "info": counts["info"]
                 }
             }
         else:
@@ -117,110 +173,107 @@ class PRAnalyzer:
         ai_analyses = analysis_result.get("ai_analyses", [])
         summary = analysis_result.get("summary", {})
         
-        comment = "## 📋 Comprehensive Code Analysis Report\n\n"
-        comment += f"**Language:** {analysis_result.get('language', 'CPP').upper()}\n"
-        comment += f"**Files Analyzed:** {analysis_result.get('files_analyzed', 0)}\n\n"
+        parts = ["## 📋 Comprehensive Code Analysis Report\n\n"]
+        parts.append(f"**Language:** {analysis_result.get('language', 'CPP').upper()}\n")
+        parts.append(f"**Files Analyzed:** {analysis_result.get('files_analyzed', 0)}\n\n")
         
         # Guidelines compliance section
-        comment += "### 📏 Guidelines Compliance\n"
+        parts.append("### 📏 Guidelines Compliance\n")
         if violations:
-            comment += f"- 🔴 **Errors:** {summary.get('errors', 0)}\n"
-            comment += f"- 🟡 **Warnings:** {summary.get('warnings', 0)}\n"
-            comment += f"- 🔵 **Info:** {summary.get('info', 0)}\n\n"
+            parts.append(f"- 🔴 **Errors:** {summary.get('errors', 0)}\n")
+            parts.append(f"- 🟡 **Warnings:** {summary.get('warnings', 0)}\n")
+            parts.append(f"- 🔵 **Info:** {summary.get('info', 0)}\n\n")
             
             if summary.get('errors', 0) > 0:
-                comment += "❗ **Please fix the errors before merging.**\n\n"
+                parts.append("❗ **Please fix the errors before merging.**\n\n")
             
             # Group violations by file
-            files_violations = {}
+            files_violations = defaultdict(list)
             for violation in violations:
-                if violation.file_path not in files_violations:
-                    files_violations[violation.file_path] = []
                 files_violations[violation.file_path].append(violation)
             
             # Show top violations (limit to prevent huge comments)
             max_files = 5
             max_violations_per_file = 8
             
-            comment += "#### Issues Found\n\n"
+            parts.append("#### Issues Found\n\n")
             
             for i, (file_path, file_violations) in enumerate(files_violations.items()):
                 if i >= max_files:
                     remaining_files = len(files_violations) - max_files
-                    comment += f"... and {remaining_files} more files\n"
+                    parts.append(f"... and {remaining_files} more files\n")
                     break
                     
-                comment += f"**📁 `{file_path}`**\n\n"
+                parts.append(f"**📁 `{file_path}`**\n\n")
                 
                 # Sort by severity (errors first)
-                sorted_violations = sorted(file_violations, 
-                                         key=lambda x: {"error": 0, "warning": 1, "info": 2}[x.severity])
+                sorted_violations = sorted(file_violations, key=lambda v: SEVERITY_ORDER[v.severity])
                 
                 for j, violation in enumerate(sorted_violations):
                     if j >= max_violations_per_file:
                         remaining = len(sorted_violations) - max_violations_per_file
-                        comment += f"... and {remaining} more issues in this file\n\n"
+                        parts.append(f"... and {remaining} more issues in this file\n\n")
                         break
                         
-                    icon = {"error": "🔴", "warning": "🟡", "info": "🔵"}[violation.severity]
-                    comment += f"{icon} **Line {violation.line_number}:** {violation.description}\n"
+                    icon = SEVERITY_ICONS[violation.severity]
+                    parts.append(f"{icon} **Line {violation.line_number}:** {violation.description}\n")
                     
                     if violation.suggestion:
-                        comment += f"💡 *{violation.suggestion}*\n"
+                        parts.append(f"💡 *{violation.suggestion}*\n")
                         
-                    comment += "\n"
+                    parts.append("\n")
         else:
-            comment += "✅ **No coding guideline violations found!**\n\n"
+            parts.append("✅ **No coding guideline violations found!**\n\n")
         
         # AI Analysis section
         if ai_analyses:
-            comment += "### 🤖 AI Code Analysis\n\n"
+            parts.append("### 🤖 AI Code Analysis\n\n")
             
             # Calculate average scores
             avg_overall = sum(a.overall_score for a in ai_analyses) / len(ai_analyses)
             avg_maintainability = sum(a.maintainability_score for a in ai_analyses) / len(ai_analyses)
             
-            comment += f"**Average Overall Score:** {avg_overall:.1f}/10\n"
-            comment += f"**Average Maintainability:** {avg_maintainability:.1f}/10\n\n"
+            parts.append(f"**Average Overall Score:** {avg_overall:.1f}/10\n")
+            parts.append(f"**Average Maintainability:** {avg_maintainability:.1f}/10\n\n")
             
             for ai_analysis in ai_analyses[:3]:  # Limit to top 3 files
-                comment += f"#### 📁 `{ai_analysis.file_path}`\n\n"
-                comment += f"**Quality Score:** {ai_analysis.overall_score}/10 | **Maintainability:** {ai_analysis.maintainability_score}/10\n\n"
+                parts.append(f"#### 📁 `{ai_analysis.file_path}`\n\n")
+                parts.append(f"**Quality Score:** {ai_analysis.overall_score}/10 | **Maintainability:** {ai_analysis.maintainability_score}/10\n\n")
                 
                 # Show key insights (truncated)
                 if ai_analysis.code_quality_insights:
                     insights = ai_analysis.code_quality_insights[:300]
                     if len(ai_analysis.code_quality_insights) > 300:
                         insights += "..."
-                    comment += f"**💭 Key Insights:** {insights}\n\n"
+                    parts.append(f"**💭 Key Insights:** {insights}\n\n")
                 
                 # Show top suggestions
                 if ai_analysis.improvement_suggestions:
-                    comment += "**💡 Top Suggestions:**\n"
+                    parts.append("**💡 Top Suggestions:**\n")
                     for suggestion in ai_analysis.improvement_suggestions[:3]:
-                        comment += f"- {suggestion}\n"
-                    comment += "\n"
+                        parts.append(f"- {suggestion}\n")
+                    parts.append("\n")
                 
                 # Show critical issues
                 if ai_analysis.potential_bugs:
-                    comment += "**🐛 Potential Issues:**\n"
+                    parts.append("**🐛 Potential Issues:**\n")
                     for bug in ai_analysis.potential_bugs[:2]:
-                        comment += f"- {bug}\n"
-                    comment += "\n"
+                        parts.append(f"- {bug}\n")
+                    parts.append("\n")
                 
                 if ai_analysis.security_concerns:
-                    comment += "**🔒 Security Concerns:**\n"
+                    parts.append("**🔒 Security Concerns:**\n")
                     for concern in ai_analysis.security_concerns[:2]:
-                        comment += f"- {concern}\n"
-                    comment += "\n"
+                        parts.append(f"- {concern}\n")
+                    parts.append("\n")
             
             if len(ai_analyses) > 3:
-                comment += f"*... and {len(ai_analyses) - 3} more files analyzed*\n\n"
+                parts.append(f"*... and {len(ai_analyses) - 3} more files analyzed*\n\n")
         
-        comment += "\n---\n"
-        comment += "*This comprehensive analysis combines traditional C++ guidelines checking with AI-powered insights. Please review and address the findings above.*"
+        parts.append("\n---\n")
+        parts.append("*This comprehensive analysis combines traditional C++ guidelines checking with AI-powered insights. Please review and address the findings above.*")
         
-        return comment
+        return "".join(parts)
 
 
 def main():
@@ -238,13 +291,15 @@ def main():
     parser.add_argument("--github-token", help="GitHub token for API access")
     parser.add_argument("--groq-api-key", help="Groq API key for AI analysis (or set GROQ_API_KEY env var)")
     parser.add_argument("--disable-ai", action="store_true", help="Disable AI analysis")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write cached results")
     
     args = parser.parse_args()
     
     analyzer = PRAnalyzer(
         github_token=args.github_token,
         groq_api_key=args.groq_api_key,
-        enable_ai=not args.disable_ai
+        enable_ai=not args.disable_ai,
+        use_cache=not args.no_cache
     )
     files_to_analyze = []
     
@@ -284,42 +339,29 @@ def main():
     
     # Generate output
     if args.format == "json":
-        # Convert violations to dict for JSON serialization
-        violations_data = []
-        for v in analysis_result.get("violations", []):
-            violations_data.append({
-                "rule_name": v.rule_name,
-                "description": v.description,
-                "file_path": v.file_path,
-                "line_number": v.line_number,
-                "line_content": v.line_content,
-                "severity": v.severity,
-                "suggestion": v.suggestion
-            })
-        
         output = {
             "language": analysis_result.get("language"),
             "files_analyzed": analysis_result.get("files_analyzed"),
             "total_violations": analysis_result.get("total_violations"),
             "summary": analysis_result.get("summary"),
-            "violations": violations_data
+            "violations": analysis_result.get("violations", [])
         }
         
-        output_text = json.dumps(output, indent=2)
+        output_text = dumps_report(output)
         
     elif args.format == "pr-comment":
         output_text = analyzer.generate_pr_comment(analysis_result)
         
     else:  # text format
         if analysis_result.get("violations"):
-            cpp_analyzer = CppGuidelinesAnalyzer()
-            output_text = cpp_analyzer.generate_report(analysis_result["violations"], "text")
+            # The analyzer that ran the checks also holds the AI analyses for the report
+            output_text = analyzer.last_analyzer.generate_report(analysis_result["violations"], "text")
         else:
             output_text = "✅ No coding guideline violations found!"
     
     # Write output
     if args.output:
-        with open(args.output, 'w') as f:
+        with open(args.output, 'w', encoding='utf-8') as f:
             f.write(output_text)
         print(f"Analysis saved to {args.output}")
     else: